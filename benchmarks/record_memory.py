@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory used by cached tasks as dicts versus TaskRecords.
+
+Usage: python benchmarks/record_memory.py [tasks]
+"""
+
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from apps.tasks.records import TaskRecord  # noqa: E402
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    tasks = build()  # noqa: F841
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main(tasks: int = 1_000_000) -> None:
+    start = datetime(2023, 1, 1)
+    documents = [
+        {
+            "_id": f"{i:024x}",
+            "title": f"Task {i}",
+            "description": None,
+            "done": i % 2 == 0,
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": start + timedelta(seconds=i),
+        }
+        for i in range(tasks)
+    ]
+
+    before = measure(
+        lambda: [
+            {
+                "id": doc["_id"],
+                "title": doc["title"],
+                "description": doc["description"],
+                "done": doc["done"],
+                "created_at": doc["created_at"],
+                "updated_at": doc["updated_at"],
+            }
+            for doc in documents
+        ]
+    )
+    after = measure(lambda: [TaskRecord.from_document(doc) for doc in documents])
+
+    print(f"dicts:       {before / 2**20:8.1f} MiB for {tasks:,} tasks")
+    print(f"TaskRecords: {after / 2**20:8.1f} MiB for {tasks:,} tasks")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
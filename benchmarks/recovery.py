@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark MemoryTaskModel recovery time.
+
+Usage: python benchmarks/recovery.py [tasks] [log_tail]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from apps.tasks.memory import MemoryTaskModel  # noqa: E402
+
+
+def main(tasks: int = 1_000_000, log_tail: int = 10_000) -> None:
+    data_dir = tempfile.mkdtemp()
+    try:
+        model = MemoryTaskModel(data_dir, fsync="never", snapshot_every=0)
+        ids = [model.create_task(f"Task {i}", done=i % 2 == 0).id for i in range(tasks)]
+        model.snapshot(wait=True)
+        for task_id in ids[:log_tail]:
+            model.update_task(task_id, done=True)
+        model.close()
+
+        start = time.perf_counter()
+        recovered = MemoryTaskModel(data_dir)
+        elapsed = time.perf_counter() - start
+        recovered.close()
+
+        print(f"Recovered {tasks:,} tasks + {log_tail:,} log entries in {elapsed:.2f}s")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -1,8 +1,22 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
 from apps.health.routes import router as health_router
-from apps.tasks.routes import router as tasks_router
+from apps.tasks.routes import (
+    router as tasks_router,
+    shutdown as shutdown_tasks,
+    startup as startup_tasks,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open storage on startup and flush and close it on shutdown."""
+    startup_tasks()
+    yield
+    shutdown_tasks()
 
 
 def create_app() -> FastAPI:
@@ -11,6 +25,7 @@ def create_app() -> FastAPI:
         title="Taskion - To-Do API",
         description="A simple FastAPI application for managing tasks",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     # Include routers
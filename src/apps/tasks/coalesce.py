@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Coalesce concurrent identical reads into one storage call.
+
+    Keys are tuples whose first element is a namespace, e.g.
+    ``("task", task_id)``. Callers that ask for a key while a call for it
+    is in flight await the same result instead of querying storage again.
+    Calls run on ``executor``; pass the executor used for writes so that
+    storage access stays serialized.
+    """
+
+    def __init__(self, executor: Executor):
+        """Initialize the in-flight table and counters."""
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple[Hashable, ...], Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(
+        self, key: Tuple[Hashable, ...], fn: Callable, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Run ``fn`` on the executor, sharing the call with identical keys."""
+        with self._lock:
+            flight = self._flights.get(key)
+            started = flight is None
+            if started:
+                self.calls += 1
+                flight = self.executor.submit(partial(fn, *args, **kwargs))
+                self._flights[key] = flight
+            else:
+                self.coalesced += 1
+        if started:
+            # Outside the lock: the callback runs at once if already done
+            flight.add_done_callback(partial(self._finish, key))
+
+        # Shield so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(asyncio.wrap_future(flight))
+
+    def forget(self, key: Tuple[Hashable, ...]) -> None:
+        """Stop sharing an in-flight call so later callers see fresh data."""
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def forget_namespace(self, namespace: Hashable) -> None:
+        """Stop sharing every in-flight call in a namespace."""
+        with self._lock:
+            for key in [key for key in self._flights if key[0] == namespace]:
+                del self._flights[key]
+
+    def _finish(self, key: Tuple[Hashable, ...], flight: Future) -> None:
+        """Drop a completed call unless it was already replaced."""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
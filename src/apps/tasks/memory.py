@@ -0,0 +1,347 @@
+import json
+import os
+import shutil
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from .records import TaskRecord, to_epoch
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class MemoryTaskModel:
+    """In-memory task model persisted with an append-only log and snapshots.
+
+    All reads are served from RAM. Every write is appended to ``tasks.log``
+    before it is acknowledged, and the log is periodically compacted into
+    ``tasks.snapshot`` on a background thread. On startup the latest
+    snapshot is loaded and the log tail is replayed on top of it.
+    """
+
+    SNAPSHOT_FILE = "tasks.snapshot"
+    LOG_FILE = "tasks.log"
+    # Log segment being compacted by an in-progress snapshot
+    ROTATED_LOG_FILE = "tasks.log.1"
+
+    def __init__(
+        self,
+        data_dir: str = "todo_mem",
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+        snapshot_every: int = 10000,
+    ):
+        """Load persisted state and open the operation log."""
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+
+        self.data_dir = data_dir
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, TaskRecord] = {}
+        # Sorted (created, id) keys, with a done flag per index position
+        self._index: List[Tuple[int, str]] = []
+        self._done = bytearray()
+        self._log_entries = 0
+        self._unsynced = False
+        self._closed = threading.Event()
+        self._snapshot_thread: Optional[threading.Thread] = None
+
+        os.makedirs(data_dir, exist_ok=True)
+        self._snapshot_path = os.path.join(data_dir, self.SNAPSHOT_FILE)
+        self._log_path = os.path.join(data_dir, self.LOG_FILE)
+        self._rotated_path = os.path.join(data_dir, self.ROTATED_LOG_FILE)
+
+        self._recover()
+        self._log = open(self._log_path, "a", encoding="utf-8")
+
+        self._sync_thread: Optional[threading.Thread] = None
+        if fsync == "interval":
+            self._sync_thread = threading.Thread(
+                target=self._sync_loop, name="taskion-fsync", daemon=True
+            )
+            self._sync_thread.start()
+
+    def create_task(
+        self, title: str, description: Optional[str] = None, done: bool = False
+    ) -> TaskRecord:
+        """Create a new task."""
+        now = to_epoch(datetime.utcnow())
+        task = TaskRecord(str(ObjectId()), title, description, done, now, now)
+
+        with self._lock:
+            self._append({"op": "put", "task": self._encode(task)})
+            self._put(task)
+            self._maybe_snapshot()
+        self._sync_write()
+        return task
+
+    def get_task_by_id(self, task_id: str) -> Optional[TaskRecord]:
+        """Get a task by its ID."""
+        return self._tasks.get(task_id)
+
+    def get_tasks_by_ids(self, task_ids: List[str]) -> Dict[str, TaskRecord]:
+        """Get the tasks matching the given IDs."""
+        tasks = self._tasks
+        return {task_id: tasks[task_id] for task_id in task_ids if task_id in tasks}
+
+    def get_tasks(
+        self, done: Optional[bool] = None, limit: int = 20, offset: int = 0
+    ) -> List[TaskRecord]:
+        """Get tasks with optional filtering, newest first."""
+        with self._lock:
+            end = len(self._index)
+            if done is None:
+                keys = self._index[max(end - offset - limit, 0) : max(end - offset, 0)]
+                keys.reverse()
+            else:
+                keys = []
+                flag = int(done)
+                while len(keys) < limit:
+                    end = self._done.rfind(flag, 0, end)
+                    if end < 0:
+                        break
+                    if offset:
+                        offset -= 1
+                    else:
+                        keys.append(self._index[end])
+
+            return [self._tasks[task_id] for _, task_id in keys]
+
+    def update_task(
+        self,
+        task_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        done: Optional[bool] = None,
+    ) -> Optional[TaskRecord]:
+        """Update a task."""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if not task:
+                return None
+
+            update_data = {"updated": to_epoch(datetime.utcnow())}
+
+            if title is not None:
+                update_data["title"] = title
+            if description is not None:
+                update_data["description"] = description
+            if done is not None:
+                update_data["done"] = done
+
+            updated_task = replace(task, **update_data)
+            self._append({"op": "put", "task": self._encode(updated_task)})
+            self._put(updated_task)
+            self._maybe_snapshot()
+        self._sync_write()
+        return updated_task
+
+    def delete_task(self, task_id: str) -> bool:
+        """Delete a task."""
+        with self._lock:
+            if task_id not in self._tasks:
+                return False
+
+            self._append({"op": "delete", "id": task_id})
+            self._delete(task_id)
+            self._maybe_snapshot()
+        self._sync_write()
+        return True
+
+    def snapshot(self, wait: bool = False) -> None:
+        """Compact the log into a new snapshot.
+
+        Tasks are copied and the log rotated under the lock; the snapshot
+        itself, and any fsync, happens on a background thread so reads and
+        writes are not blocked. Does nothing if a snapshot is already being written,
+        unless ``wait`` is set.
+        """
+        if wait:
+            self._join_snapshot()
+
+        with self._lock:
+            if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+                return
+
+            tasks = list(self._tasks.values())
+            self._rotate_log()
+            self._snapshot_thread = threading.Thread(
+                target=self._write_snapshot, args=(tasks,), name="taskion-snapshot"
+            )
+            self._snapshot_thread.start()
+
+        if wait:
+            self._join_snapshot()
+
+    def close(self) -> None:
+        """Wait for any running snapshot, then flush and close the log."""
+        self._closed.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+        self._join_snapshot()
+        with self._lock:
+            if not self._log.closed:
+                self._log.flush()
+                if self.fsync != "never":
+                    os.fsync(self._log.fileno())
+                self._log.close()
+
+    def _recover(self) -> None:
+        """Load the snapshot and replay the log on top of it."""
+        tasks = {}
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as f:
+                for data in json.load(f):
+                    task = TaskRecord(*data)
+                    tasks[task.id] = task
+
+        # Entries are idempotent, so replaying a segment already in the
+        # snapshot is harmless
+        for path in (self._rotated_path, self._log_path):
+            if os.path.exists(path):
+                self._replay(path, tasks)
+
+        self._tasks = tasks
+        entries = sorted((task.created, task.id, task.done) for task in tasks.values())
+        self._index = [(created_at, task_id) for created_at, task_id, _ in entries]
+        self._done = bytearray(done for _, _, done in entries)
+
+    def _replay(self, path: str, tasks: Dict[str, TaskRecord]) -> None:
+        """Apply log entries to ``tasks``, truncating a torn final line."""
+        with open(path, "rb+") as f:
+            offset = 0
+            for number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    entry = None
+
+                if entry is None:
+                    if f.read(1):
+                        raise ValueError(f"Corrupt log entry at {path}:{number}")
+                    # A crash mid-append leaves a partial last line
+                    f.truncate(offset)
+                    break
+
+                if entry["op"] == "put":
+                    task = TaskRecord(*entry["task"])
+                    tasks[task.id] = task
+                else:
+                    tasks.pop(entry["id"], None)
+                offset += len(line)
+                self._log_entries += 1
+
+    def _append(self, entry: Dict) -> None:
+        """Append an operation to the log; the caller syncs it per the policy."""
+        self._log.write(json.dumps(entry) + "\n")
+        self._log.flush()
+        self._unsynced = True
+
+        self._log_entries += 1
+
+    def _sync_write(self) -> None:
+        """Make a write durable before it is acknowledged under ``always``."""
+        if self.fsync == "always":
+            self._sync(force=True)
+
+    def _sync_loop(self) -> None:
+        """Fsync the log every ``fsync_interval`` seconds until closed."""
+        while not self._closed.wait(self.fsync_interval):
+            self._sync()
+
+    def _sync(self, force: bool = False) -> None:
+        """Fsync appended log entries without holding the lock meanwhile.
+
+        ``force`` syncs even if another thread already claimed the pending
+        entries, so a write is durable once this returns.
+        """
+        with self._lock:
+            if not (force or self._unsynced) or self._log.closed:
+                return
+            # A duplicate descriptor stays valid if the log is rotated
+            fd = os.dup(self._log.fileno())
+            self._unsynced = False
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _maybe_snapshot(self) -> None:
+        """Compact the log once it has grown past ``snapshot_every`` entries."""
+        if self.snapshot_every and self._log_entries >= self.snapshot_every:
+            self.snapshot()
+
+    def _rotate_log(self) -> None:
+        """Move the current log aside for compaction and start a new one."""
+        # The snapshot thread fsyncs the rotated segment, outside the lock
+        self._log.close()
+
+        if os.path.exists(self._rotated_path):
+            # A previous snapshot failed; its segment must be kept first
+            with open(self._log_path, encoding="utf-8") as src, open(
+                self._rotated_path, "a", encoding="utf-8"
+            ) as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self._log_path)
+        else:
+            os.replace(self._log_path, self._rotated_path)
+
+        self._log = open(self._log_path, "a", encoding="utf-8")
+        self._log_entries = 0
+
+    def _write_snapshot(self, tasks: List[TaskRecord]) -> None:
+        """Write a snapshot and drop the log segment it compacts."""
+        if self.fsync != "never":
+            with open(self._rotated_path, "rb") as f:
+                os.fsync(f.fileno())
+
+        tmp_path = self._snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([self._encode(task) for task in tasks], f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+        os.remove(self._rotated_path)
+
+    def _join_snapshot(self) -> None:
+        """Wait for a background snapshot to finish."""
+        thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+
+    def _put(self, task: TaskRecord) -> None:
+        """Insert or replace a task and keep the indexes in sync."""
+        key = (task.created, task.id)
+        if task.id in self._tasks:
+            self._done[bisect_left(self._index, key)] = task.done
+        else:
+            pos = bisect_right(self._index, key)
+            self._index.insert(pos, key)
+            self._done.insert(pos, task.done)
+        self._tasks[task.id] = task
+
+    def _delete(self, task_id: str) -> None:
+        """Remove a task and its index entries."""
+        task = self._tasks.pop(task_id)
+        pos = bisect_left(self._index, (task.created, task_id))
+        del self._index[pos]
+        del self._done[pos]
+
+    def _encode(self, task: TaskRecord) -> List:
+        """Convert a task to its compact JSON representation."""
+        return [
+            task.id,
+            task.title,
+            task.description,
+            task.done,
+            task.created,
+            task.updated,
+        ]
@@ -4,6 +4,8 @@ from typing import Dict, List, Optional
 from bson import ObjectId
 from montydb import MontyClient
 
+from .records import TaskRecord
+
 
 class TaskModel:
     """Database model for tasks using MontyDB."""
@@ -16,7 +18,7 @@ class TaskModel:
 
     def create_task(
         self, title: str, description: Optional[str] = None, done: bool = False
-    ) -> Dict:
+    ) -> TaskRecord:
         """Create a new task."""
         now = datetime.utcnow()
         task_data = {
@@ -31,16 +33,21 @@ class TaskModel:
         self.collection.insert_one(task_data)
         return self._format_task(task_data)
 
-    def get_task_by_id(self, task_id: str) -> Optional[Dict]:
+    def get_task_by_id(self, task_id: str) -> Optional[TaskRecord]:
         """Get a task by its ID."""
         task = self.collection.find_one({"_id": task_id})
         if task:
             return self._format_task(task)
         return None
 
+    def get_tasks_by_ids(self, task_ids: List[str]) -> Dict[str, TaskRecord]:
+        """Get the tasks matching the given IDs in a single query."""
+        tasks = self.collection.find({"_id": {"$in": list(set(task_ids))}})
+        return {task["_id"]: self._format_task(task) for task in tasks}
+
     def get_tasks(
         self, done: Optional[bool] = None, limit: int = 20, offset: int = 0
-    ) -> List[Dict]:
+    ) -> List[TaskRecord]:
         """Get tasks with optional filtering."""
         query = {}
         if done is not None:
@@ -58,7 +65,7 @@ class TaskModel:
         title: Optional[str] = None,
         description: Optional[str] = None,
         done: Optional[bool] = None,
-    ) -> Optional[Dict]:
+    ) -> Optional[TaskRecord]:
         """Update a task."""
         # Check if task exists
         if not self.collection.find_one({"_id": task_id}):
@@ -83,13 +90,10 @@ class TaskModel:
         result = self.collection.delete_one({"_id": task_id})
         return result.deleted_count > 0
 
-    def _format_task(self, task: Dict) -> Dict:
+    def close(self) -> None:
+        """Close the database connection."""
+        self.client.close()
+
+    def _format_task(self, task: Dict) -> TaskRecord:
         """Format task data for API response."""
-        return {
-            "id": task["_id"],
-            "title": task["title"],
-            "description": task["description"],
-            "done": task["done"],
-            "created_at": task["created_at"],
-            "updated_at": task["updated_at"],
-        }
+        return TaskRecord.from_document(task)
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch(value: datetime) -> int:
+    """Convert a naive UTC datetime to integer microseconds since the epoch."""
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_epoch(value: int) -> datetime:
+    """Convert integer microseconds since the epoch to a naive UTC datetime."""
+    return EPOCH + timedelta(microseconds=value)
+
+
+@dataclass(frozen=True, slots=True)
+class TaskRecord:
+    """Compact, immutable task passed from storage to the response layer.
+
+    Timestamps are kept as epoch microseconds and exposed as datetimes
+    through ``created_at``/``updated_at``, so ``TaskOut.model_validate``
+    can read a record directly without building an intermediate dict.
+    """
+
+    id: str
+    title: str
+    description: Optional[str]
+    done: bool
+    created: int
+    updated: int
+
+    @property
+    def created_at(self) -> datetime:
+        return from_epoch(self.created)
+
+    @property
+    def updated_at(self) -> datetime:
+        return from_epoch(self.updated)
+
+    @classmethod
+    def from_document(cls, doc: Dict) -> "TaskRecord":
+        """Build a record from a stored task document."""
+        return cls(
+            doc["_id"],
+            doc["title"],
+            doc["description"],
+            doc["done"],
+            to_epoch(doc["created_at"]),
+            to_epoch(doc["updated_at"]),
+        )
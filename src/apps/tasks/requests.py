@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -27,6 +27,14 @@ class TaskCreate(BaseModel):
         return v.strip() if v else None
 
 
+class TaskBatchGet(BaseModel):
+    """Request model for fetching many tasks by ID."""
+
+    ids: List[str] = Field(
+        ..., min_length=1, max_length=200, description="Task IDs to fetch"
+    )
+
+
 class TaskUpdate(BaseModel):
     """Request model for updating a task."""
 
@@ -16,3 +16,18 @@ class TaskOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TaskLookup(BaseModel):
+    """Response model for one entry of a batch task lookup."""
+
+    id: str
+    found: bool
+    task: Optional[TaskOut] = None
+
+
+class ReadStats(BaseModel):
+    """Response model for single-task and list read coalescing counters."""
+
+    calls: int
+    coalesced: int
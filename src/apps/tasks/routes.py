@@ -1,25 +1,98 @@
-from typing import List, Optional
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Hashable, List, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import Response
 
+from .coalesce import SingleFlight
+from .memory import MemoryTaskModel
 from .models import TaskModel
-from .requests import TaskCreate, TaskUpdate
-from .responses import TaskOut
+from .requests import TaskBatchGet, TaskCreate, TaskUpdate
+from .responses import ReadStats, TaskLookup, TaskOut
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-# Initialize the database model
-task_model = TaskModel()
+# Storage is created by startup() and released by shutdown()
+task_model = None
+storage: Optional[ThreadPoolExecutor] = None
+reads: Optional[SingleFlight] = None
+
+
+def startup() -> None:
+    """Create the task model and storage executor on application startup."""
+    global task_model, storage, reads
+
+    if os.getenv("TASKION_ENGINE") == "memory":
+        task_model = MemoryTaskModel(fsync=os.getenv("TASKION_FSYNC", "interval"))
+        # The model locks itself and reads are served from RAM on the event
+        # loop; only writes, which may fsync, go to worker threads
+        storage = ThreadPoolExecutor(thread_name_prefix="taskion-storage")
+        reads = None
+    else:
+        task_model = TaskModel()
+        # All storage calls run on one worker thread: MontyDB is not
+        # thread-safe, and the event loop must not block on queries
+        storage = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="taskion-storage"
+        )
+        # Concurrent identical reads share one storage call
+        reads = SingleFlight(storage)
+
+
+def shutdown() -> None:
+    """Close the task model and storage executor on application shutdown."""
+    global task_model, storage, reads
+
+    storage.submit(task_model.close).result()
+    storage.shutdown()
+    task_model = storage = reads = None
+
+
+async def run_storage(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Run a storage call on the storage executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(storage, partial(fn, *args, **kwargs))
+
+
+async def run_read(
+    key: Optional[Tuple[Hashable, ...]], fn: Callable, *args: Any, **kwargs: Any
+) -> Any:
+    """Run a storage read.
+
+    Without coalescing (the memory engine) the read is served directly.
+    Otherwise it runs on the storage executor, shared with identical
+    in-flight reads when ``key`` is given.
+    """
+    if reads is None:
+        return fn(*args, **kwargs)
+    if key is None:
+        return await run_storage(fn, *args, **kwargs)
+    return await reads.do(key, fn, *args, **kwargs)
+
+
+def invalidate_reads(task_id: Optional[str] = None) -> None:
+    """Stop sharing in-flight reads that a write may have made stale."""
+    if reads is None:
+        return
+    if task_id is not None:
+        reads.forget(("task", task_id))
+    reads.forget_namespace("tasks")
 
 
 @router.post("/", response_model=TaskOut, status_code=201)
 async def create_task(task_data: TaskCreate):
     """Create a new task."""
-    task = task_model.create_task(
-        title=task_data.title, description=task_data.description, done=task_data.done
+    task = await run_storage(
+        task_model.create_task,
+        title=task_data.title,
+        description=task_data.description,
+        done=task_data.done,
     )
-    return TaskOut(**task)
+    invalidate_reads()
+    return TaskOut.model_validate(task)
 
 
 @router.get("/", response_model=List[TaskOut])
@@ -29,17 +102,45 @@ async def get_tasks(
     offset: int = Query(0, ge=0, description="Number of tasks to skip"),
 ):
     """Get all tasks with optional filtering."""
-    tasks = task_model.get_tasks(done=done, limit=limit, offset=offset)
-    return [TaskOut(**task) for task in tasks]
+    tasks = await run_read(
+        ("tasks", done, limit, offset),
+        task_model.get_tasks,
+        done=done,
+        limit=limit,
+        offset=offset,
+    )
+    return [TaskOut.model_validate(task) for task in tasks]
+
+
+@router.post("/batch-get", response_model=List[TaskLookup])
+async def batch_get_tasks(batch: TaskBatchGet):
+    """Get many tasks by ID, in request order."""
+    tasks = await run_read(None, task_model.get_tasks_by_ids, batch.ids)
+    return [
+        TaskLookup(
+            id=task_id,
+            found=task_id in tasks,
+            task=TaskOut.model_validate(tasks[task_id]) if task_id in tasks else None,
+        )
+        for task_id in batch.ids
+    ]
+
+
+@router.get("/stats", response_model=ReadStats)
+async def get_read_stats():
+    """Get single-task and list reads made and saved by coalescing."""
+    if reads is None:
+        return ReadStats(calls=0, coalesced=0)
+    return ReadStats(calls=reads.calls, coalesced=reads.coalesced)
 
 
 @router.get("/{task_id}", response_model=TaskOut)
 async def get_task(task_id: str):
     """Get a specific task by ID."""
-    task = task_model.get_task_by_id(task_id)
+    task = await run_read(("task", task_id), task_model.get_task_by_id, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return TaskOut(**task)
+    return TaskOut.model_validate(task)
 
 
 @router.put("/{task_id}", response_model=TaskOut)
@@ -51,23 +152,26 @@ async def update_task(task_id: str, task_update: TaskUpdate):
             status_code=400, detail="At least one field must be provided for update"
         )
 
-    updated_task = task_model.update_task(
+    updated_task = await run_storage(
+        task_model.update_task,
         task_id=task_id,
         title=task_update.title,
         description=task_update.description,
         done=task_update.done,
     )
+    invalidate_reads(task_id)
 
     if not updated_task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return TaskOut(**updated_task)
+    return TaskOut.model_validate(updated_task)
 
 
 @router.delete("/{task_id}", status_code=204)
 async def delete_task(task_id: str):
     """Delete a task."""
-    success = task_model.delete_task(task_id)
+    success = await run_storage(task_model.delete_task, task_id)
+    invalidate_reads(task_id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     return Response(status_code=204)
@@ -7,6 +7,13 @@ from src.app import app
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module", autouse=True)
+def lifespan():
+    """Run application startup and shutdown around the tests."""
+    with client:
+        yield
+
+
 @pytest.fixture
 def mock_task_model():
     """Mock the TaskModel for testing."""
@@ -86,6 +93,31 @@ class TestTaskAPI:
         assert response.status_code == 404
         assert response.json() == {"detail": "Task not found"}
 
+    def test_batch_get_tasks(self, mock_task_model, sample_task):
+        """Test fetching many tasks in request order."""
+        mock_task_model.get_tasks_by_ids.return_value = {sample_task["id"]: sample_task}
+
+        response = client.post(
+            "/tasks/batch-get", json={"ids": ["missing", sample_task["id"]]}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0] == {"id": "missing", "found": False, "task": None}
+        assert data[1]["found"] is True
+        assert data[1]["task"]["title"] == "Test Task"
+        mock_task_model.get_tasks_by_ids.assert_called_once_with(
+            ["missing", sample_task["id"]]
+        )
+
+    def test_batch_get_tasks_validation_error(self):
+        """Test batch size limits."""
+        response = client.post("/tasks/batch-get", json={"ids": []})
+        assert response.status_code == 422
+
+        response = client.post("/tasks/batch-get", json={"ids": ["x"] * 201})
+        assert response.status_code == 422
+
     def test_update_task(self, mock_task_model, sample_task):
         """Test updating a task."""
         updated_task = sample_task.copy()
@@ -100,6 +132,42 @@ class TestTaskAPI:
         data = response.json()
         assert data["title"] == "Updated Task"
 
+    def test_writes_invalidate_coalesced_reads(self, mock_task_model, sample_task):
+        """Test writes stop sharing in-flight reads for the same task."""
+        mock_task_model.update_task.return_value = sample_task
+
+        with patch("apps.tasks.routes.reads") as mock_reads:
+            client.put(
+                "/tasks/507f1f77bcf86cd799439011", json={"title": "Updated Task"}
+            )
+
+        mock_reads.forget.assert_called_once_with(("task", "507f1f77bcf86cd799439011"))
+        mock_reads.forget_namespace.assert_called_once_with("tasks")
+
+    def test_read_stats(self):
+        """Test the read coalescing counters are exposed."""
+        with patch("apps.tasks.routes.reads") as mock_reads:
+            mock_reads.calls = 5
+            mock_reads.coalesced = 3
+
+            response = client.get("/tasks/stats")
+
+        assert response.status_code == 200
+        assert response.json() == {"calls": 5, "coalesced": 3}
+
+    def test_read_stats_count_storage_reads(self, mock_task_model, sample_task):
+        """Test single-task reads are counted and batch-get reads are not."""
+        mock_task_model.get_task_by_id.return_value = sample_task
+        before = client.get("/tasks/stats").json()
+
+        client.get("/tasks/507f1f77bcf86cd799439011")
+        mock_task_model.get_tasks_by_ids.return_value = {}
+        client.post("/tasks/batch-get", json={"ids": ["507f1f77bcf86cd799439011"]})
+
+        after = client.get("/tasks/stats").json()
+        # Only single-task and list reads are counted
+        assert after["calls"] == before["calls"] + 1
+
     def test_update_task_empty_body(self):
         """Test updating with empty body."""
         response = client.put("/tasks/507f1f77bcf86cd799439011", json={})
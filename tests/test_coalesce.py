@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from apps.tasks.coalesce import SingleFlight
+
+
+@pytest.fixture
+def executor():
+    """Worker threads for storage calls."""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+class SlowBackend:
+    """Fake storage backend that takes a while to answer."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = 0
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def get_task_by_id(self, task_id):
+        with self._lock:
+            self.calls += 1
+            version = self.version
+        time.sleep(self.delay)
+        return {"id": task_id, "version": version}
+
+    def get_tasks(self, done=None, limit=20, offset=0):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return [{"done": done, "limit": limit, "offset": offset}]
+
+    def fail(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        raise RuntimeError("storage unavailable")
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical reads."""
+
+    async def test_identical_reads_share_one_call(self, executor):
+        """Test concurrent callers with the same key hit storage once."""
+        backend = SlowBackend()
+        reads = SingleFlight(executor)
+
+        results = await asyncio.gather(
+            *(reads.do(("task", "1"), backend.get_task_by_id, "1") for _ in range(10))
+        )
+
+        assert backend.calls == 1
+        assert all(result == {"id": "1", "version": 0} for result in results)
+        assert reads.calls == 1
+        assert reads.coalesced == 9
+
+    async def test_different_reads_are_not_shared(self, executor):
+        """Test callers with different arguments get separate calls."""
+        backend = SlowBackend()
+        reads = SingleFlight(executor)
+
+        first, second = await asyncio.gather(
+            reads.do(("tasks", None, 20, 0), backend.get_tasks, limit=20),
+            reads.do(("tasks", None, 20, 20), backend.get_tasks, offset=20),
+        )
+
+        assert backend.calls == 2
+        assert first[0]["offset"] == 0
+        assert second[0]["offset"] == 20
+        assert reads.coalesced == 0
+
+    async def test_sequential_reads_are_not_shared(self, executor):
+        """Test a completed call is not reused by later callers."""
+        backend = SlowBackend(delay=0)
+        reads = SingleFlight(executor)
+
+        await reads.do(("task", "1"), backend.get_task_by_id, "1")
+        await reads.do(("task", "1"), backend.get_task_by_id, "1")
+
+        assert backend.calls == 2
+
+    async def test_forget_starts_fresh_call(self, executor):
+        """Test callers after a write do not join a stale in-flight read."""
+        backend = SlowBackend()
+        reads = SingleFlight(executor)
+
+        stale = asyncio.ensure_future(
+            reads.do(("task", "1"), backend.get_task_by_id, "1")
+        )
+        await asyncio.sleep(0.02)
+
+        backend.version = 1
+        reads.forget(("task", "1"))
+        fresh = asyncio.ensure_future(
+            reads.do(("task", "1"), backend.get_task_by_id, "1")
+        )
+        joined = asyncio.ensure_future(
+            reads.do(("task", "1"), backend.get_task_by_id, "1")
+        )
+
+        assert (await stale)["version"] == 0
+        assert (await fresh)["version"] == 1
+        assert (await joined)["version"] == 1
+        assert backend.calls == 2
+        assert reads.coalesced == 1
+
+    async def test_forget_namespace(self, executor):
+        """Test every in-flight key in a namespace is dropped."""
+        backend = SlowBackend()
+        reads = SingleFlight(executor)
+
+        flights = [
+            asyncio.ensure_future(reads.do(key, backend.get_tasks))
+            for key in [("tasks", None, 20, 0), ("tasks", True, 20, 0)]
+        ]
+        flights.append(
+            asyncio.ensure_future(reads.do(("task", "1"), backend.get_task_by_id, "1"))
+        )
+        await asyncio.sleep(0)
+
+        reads.forget_namespace("tasks")
+
+        assert list(reads._flights) == [("task", "1")]
+        await asyncio.gather(*flights)
+        assert reads._flights == {}
+
+    async def test_errors_reach_every_caller(self, executor):
+        """Test a failed call raises for all waiters and is not cached."""
+        backend = SlowBackend()
+        reads = SingleFlight(executor)
+
+        results = await asyncio.gather(
+            *(reads.do(("fail",), backend.fail) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert backend.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        with pytest.raises(RuntimeError):
+            await reads.do(("fail",), backend.fail)
+        assert backend.calls == 2
+
+    async def test_cancelled_caller_does_not_cancel_others(self, executor):
+        """Test cancelling one waiter leaves the shared call running."""
+        backend = SlowBackend()
+        reads = SingleFlight(executor)
+
+        first = asyncio.ensure_future(
+            reads.do(("task", "1"), backend.get_task_by_id, "1")
+        )
+        second = asyncio.ensure_future(
+            reads.do(("task", "1"), backend.get_task_by_id, "1")
+        )
+        await asyncio.sleep(0.02)
+        first.cancel()
+
+        assert (await second)["id"] == "1"
+        assert first.cancelled()
+        assert backend.calls == 1
@@ -3,8 +3,13 @@ from fastapi.testclient import TestClient
 import tempfile
 import os
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 from app import app
+from apps.tasks.memory import MemoryTaskModel
 
 client = TestClient(app)
 
@@ -18,12 +23,13 @@ def temp_db():
     # Patch the TaskModel to use temporary database
     from unittest.mock import patch
 
-    with patch("apps.tasks.routes.task_model") as mock_model:
+    with client, patch("apps.tasks.routes.task_model") as mock_model:
         from apps.tasks.models import TaskModel
 
         real_model = TaskModel(db_path=db_path)
         mock_model.create_task = real_model.create_task
         mock_model.get_task_by_id = real_model.get_task_by_id
+        mock_model.get_tasks_by_ids = real_model.get_tasks_by_ids
         mock_model.get_tasks = real_model.get_tasks
         mock_model.update_task = real_model.update_task
         mock_model.delete_task = real_model.delete_task
@@ -98,3 +104,105 @@ def test_task_filtering_and_pagination(temp_db):
     pending_tasks = client.get("/tasks/?done=false")
     assert pending_tasks.status_code == 200
     assert len(pending_tasks.json()) == 2  # Tasks 2, 4
+
+
+def test_batch_get_tasks(temp_db):
+    """Test fetching many tasks with one request."""
+    task_ids = [
+        client.post("/tasks/", json={"title": f"Task {i + 1}"}).json()["id"]
+        for i in range(3)
+    ]
+    ids = [task_ids[2], "missing", task_ids[0], task_ids[2]]
+
+    response = client.post("/tasks/batch-get", json={"ids": ids})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [entry["id"] for entry in data] == ids
+    assert [entry["found"] for entry in data] == [True, False, True, True]
+    assert data[0]["task"]["title"] == "Task 3"
+    assert data[1]["task"] is None
+    assert data[2]["task"]["title"] == "Task 1"
+
+
+def test_concurrent_reads_and_writes(temp_db):
+    """Test mixed concurrent reads and writes against the real database."""
+    task_ids = [temp_db.create_task(f"Task {i + 1}").id for i in range(50)]
+
+    def request(i):
+        task_id = task_ids[i % 50]
+        responses = [
+            # Distinct arguments so the reads are not coalesced away
+            client.get(f"/tasks/{task_ids[i % 50 - i % 2]}"),
+            client.get(f"/tasks/?limit=100&offset={i % 50}"),
+            client.post("/tasks/", json={"title": f"New {i}"}),
+            client.post("/tasks/batch-get", json={"ids": task_ids[i % 50 :]}),
+        ]
+        if i < 50 and i % 2:
+            responses.append(client.delete(f"/tasks/{task_id}"))
+        elif i < 50:
+            responses.append(client.put(f"/tasks/{task_id}", json={"done": True}))
+        return [response.status_code for response in responses]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = [
+            code for codes in executor.map(request, range(100)) for code in codes
+        ]
+
+    assert all(status < 300 for status in statuses)
+    assert len(temp_db.get_tasks(limit=1000)) == 125
+    assert len(temp_db.get_tasks(done=True, limit=1000)) == 25
+
+
+def test_restart_in_same_process(tmp_path, monkeypatch):
+    """Test the memory engine works across repeated startup and shutdown."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TASKION_ENGINE", "memory")
+    task_ids = []
+
+    for i in range(2):
+        with TestClient(app) as restarted:
+            response = restarted.post("/tasks/", json={"title": f"Task {i + 1}"})
+            assert response.status_code == 201
+            task_ids.append(response.json()["id"])
+
+            tasks = restarted.get("/tasks/").json()
+            assert [task["id"] for task in tasks] == task_ids[::-1]
+
+    assert (tmp_path / "todo_mem" / MemoryTaskModel.LOG_FILE).exists()
+
+
+def test_memory_reads_do_not_wait_for_fsync(tmp_path, monkeypatch):
+    """Test memory engine reads are served while a write is syncing."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TASKION_ENGINE", "memory")
+    monkeypatch.setenv("TASKION_FSYNC", "always")
+    fsync = os.fsync
+    syncing = threading.Event()
+    release = threading.Event()
+
+    def slow_fsync(fd):
+        syncing.set()
+        release.wait(5)
+        fsync(fd)
+
+    with TestClient(app) as memory_client:
+        task_id = memory_client.post("/tasks/", json={"title": "First"}).json()["id"]
+
+        with patch("apps.tasks.memory.os.fsync", slow_fsync):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                write = executor.submit(
+                    memory_client.post, "/tasks/", json={"title": "Second"}
+                )
+                assert syncing.wait(5)
+
+                start = time.monotonic()
+                assert memory_client.get(f"/tasks/{task_id}").status_code == 200
+                assert len(memory_client.get("/tasks/").json()) == 2
+                assert time.monotonic() - start < 1
+                assert not write.done()
+
+                release.set()
+                assert write.result().status_code == 201
+
+        assert memory_client.get("/tasks/stats").json() == {"calls": 0, "coalesced": 0}
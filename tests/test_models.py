@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 from pydantic import ValidationError
 from datetime import datetime
@@ -5,7 +8,9 @@ from unittest.mock import Mock, patch
 
 from apps.tasks.requests import TaskCreate, TaskUpdate
 from apps.tasks.responses import TaskOut
+from apps.tasks.memory import MemoryTaskModel
 from apps.tasks.models import TaskModel
+from apps.tasks.records import TaskRecord, from_epoch, to_epoch
 
 
 class TestTaskCreateModel:
@@ -89,6 +94,47 @@ class TestTaskOutModel:
         assert task.updated_at == now
 
 
+class TestTaskRecord:
+    """Test the compact TaskRecord passed between storage and responses."""
+
+    def test_epoch_round_trip(self):
+        """Test timestamps survive conversion to epoch microseconds."""
+        now = datetime(2023, 1, 1, 12, 0, 0, 123456)
+        assert from_epoch(to_epoch(now)) == now
+
+    def test_from_document(self):
+        """Test building a record from a stored document."""
+        record = TaskRecord.from_document(
+            {
+                "_id": "507f1f77bcf86cd799439011",
+                "title": "Test Task",
+                "description": None,
+                "done": True,
+                "created_at": datetime(2023, 1, 1),
+                "updated_at": datetime(2023, 1, 2),
+            }
+        )
+
+        assert record.id == "507f1f77bcf86cd799439011"
+        assert record.created_at == datetime(2023, 1, 1)
+        assert record.updated_at == datetime(2023, 1, 2)
+        assert not hasattr(record, "__dict__")
+
+    def test_task_out_from_record(self):
+        """Test TaskOut reads a record without an intermediate dict."""
+        now = datetime(2023, 1, 1, 12, 0, 0)
+        record = TaskRecord("1", "Test Task", None, False, to_epoch(now), 0)
+
+        task = TaskOut.model_validate(record)
+
+        assert task.id == "1"
+        assert task.created_at == now
+        assert task.updated_at == datetime(1970, 1, 1)
+        # Validated through attributes, not a mapping interface
+        with pytest.raises(TypeError):
+            record["id"]
+
+
 class TestTaskDatabaseModel:
     """Test TaskModel database operations."""
 
@@ -110,12 +156,12 @@ class TestTaskDatabaseModel:
 
             result = model.create_task("Test Task", "Test Description", False)
 
-            assert result["id"] == "507f1f77bcf86cd799439011"
-            assert result["title"] == "Test Task"
-            assert result["description"] == "Test Description"
-            assert result["done"] is False
-            assert result["created_at"] == now
-            assert result["updated_at"] == now
+            assert result.id == "507f1f77bcf86cd799439011"
+            assert result.title == "Test Task"
+            assert result.description == "Test Description"
+            assert result.done is False
+            assert result.created_at == now
+            assert result.updated_at == now
 
     @patch("apps.tasks.models.MontyClient")
     def test_get_task_by_id(self, mock_client):
@@ -136,5 +182,179 @@ class TestTaskDatabaseModel:
         model = TaskModel("test_db")
         result = model.get_task_by_id("507f1f77bcf86cd799439011")
 
-        assert result["id"] == "507f1f77bcf86cd799439011"
-        assert result["title"] == "Test Task"
+        assert result.id == "507f1f77bcf86cd799439011"
+        assert result.title == "Test Task"
+
+    @patch("apps.tasks.models.MontyClient")
+    def test_get_tasks_by_ids(self, mock_client):
+        """Test getting many tasks with a single $in query."""
+        mock_collection = Mock()
+        mock_client.return_value.todo.tasks = mock_collection
+
+        mock_collection.find.return_value = [
+            {
+                "_id": "507f1f77bcf86cd799439011",
+                "title": "Test Task",
+                "description": None,
+                "done": False,
+                "created_at": datetime(2023, 1, 1),
+                "updated_at": datetime(2023, 1, 1),
+            }
+        ]
+
+        model = TaskModel("test_db")
+        result = model.get_tasks_by_ids(["507f1f77bcf86cd799439011"] * 2)
+
+        mock_collection.find.assert_called_once_with(
+            {"_id": {"$in": ["507f1f77bcf86cd799439011"]}}
+        )
+        assert result["507f1f77bcf86cd799439011"].title == "Test Task"
+
+
+class TestMemoryTaskModel:
+    """Test MemoryTaskModel in-memory storage and recovery."""
+
+    def test_crud(self, tmp_path):
+        """Test create, read, update and delete."""
+        model = MemoryTaskModel(str(tmp_path), fsync="always")
+
+        task = model.create_task("Test Task", "Test Description")
+        assert model.get_task_by_id(task.id) == task
+
+        updated = model.update_task(task.id, title="Updated Task", done=True)
+        assert updated.title == "Updated Task"
+        assert updated.done is True
+        assert updated.created_at == task.created_at
+
+        assert model.update_task("missing", title="x") is None
+        assert model.delete_task(task.id) is True
+        assert model.delete_task(task.id) is False
+        assert model.get_task_by_id(task.id) is None
+
+    def test_get_tasks_by_ids(self, tmp_path):
+        """Test fetching many tasks by ID."""
+        model = MemoryTaskModel(str(tmp_path), fsync="never")
+        task = model.create_task("Test Task")
+
+        assert model.get_tasks_by_ids([task.id, "missing"]) == {task.id: task}
+
+    def test_get_tasks_filtering_and_pagination(self, tmp_path):
+        """Test newest-first ordering with done filter and offsets."""
+        model = MemoryTaskModel(str(tmp_path), fsync="never")
+        ids = [model.create_task(f"Task {i}", done=i % 2 == 0).id for i in range(5)]
+
+        assert [t.id for t in model.get_tasks()] == ids[::-1]
+        assert [t.id for t in model.get_tasks(limit=2, offset=1)] == [
+            ids[3],
+            ids[2],
+        ]
+        assert [t.id for t in model.get_tasks(done=True)] == [
+            ids[4],
+            ids[2],
+            ids[0],
+        ]
+        assert [t.id for t in model.get_tasks(done=False, offset=1)] == [ids[1]]
+        assert model.get_tasks(offset=10) == []
+
+        model.update_task(ids[1], done=True)
+        assert len(model.get_tasks(done=True)) == 4
+
+    def test_recovery_from_snapshot_and_log(self, tmp_path):
+        """Test state is restored from the snapshot plus the log tail."""
+        model = MemoryTaskModel(str(tmp_path), fsync="always", snapshot_every=3)
+        first = model.create_task("First")
+        second = model.create_task("Second")
+        model.update_task(first.id, done=True)  # triggers a snapshot
+        model.delete_task(second.id)
+        third = model.create_task("Third")
+        model.close()
+
+        recovered = MemoryTaskModel(str(tmp_path))
+        assert recovered.get_task_by_id(second.id) is None
+        assert recovered.get_task_by_id(first.id).done is True
+        assert [t.id for t in recovered.get_tasks()] == [third.id, first.id]
+
+    def test_snapshot_does_not_block_reads(self, tmp_path):
+        """Test the snapshot is written while reads and writes continue."""
+        model = MemoryTaskModel(str(tmp_path), fsync="never", snapshot_every=0)
+        task = model.create_task("Test Task")
+        release = threading.Event()
+        write_snapshot = model._write_snapshot
+
+        def slow_write_snapshot(tasks):
+            release.wait(5)
+            write_snapshot(tasks)
+
+        with patch.object(model, "_write_snapshot", slow_write_snapshot):
+            model.snapshot()
+            assert model.get_tasks() == [task]
+            model.create_task("During snapshot")
+            release.set()
+            model.close()
+
+        assert not (tmp_path / MemoryTaskModel.ROTATED_LOG_FILE).exists()
+        assert len(MemoryTaskModel(str(tmp_path)).get_tasks()) == 2
+
+    def test_recovery_replays_rotated_log(self, tmp_path):
+        """Test a crash before the snapshot is written loses no entries."""
+        model = MemoryTaskModel(str(tmp_path), fsync="always", snapshot_every=0)
+        first = model.create_task("First")
+        with patch.object(model, "_write_snapshot"):
+            model.snapshot()
+        second = model.create_task("Second")
+        model.close()
+
+        recovered = MemoryTaskModel(str(tmp_path))
+        assert [t.id for t in recovered.get_tasks()] == [second.id, first.id]
+
+    def test_recovery_ignores_torn_log_tail(self, tmp_path):
+        """Test a partially written last log entry is discarded."""
+        model = MemoryTaskModel(str(tmp_path), fsync="always")
+        task = model.create_task("Test Task")
+        model.close()
+
+        with open(tmp_path / MemoryTaskModel.LOG_FILE, "a") as f:
+            f.write('{"op": "delete", "id"')
+
+        recovered = MemoryTaskModel(str(tmp_path))
+        assert recovered.get_task_by_id(task.id).title == "Test Task"
+        recovered.create_task("After recovery")
+        recovered.close()
+
+        assert len(MemoryTaskModel(str(tmp_path)).get_tasks()) == 2
+
+    def test_interval_fsync_runs_when_idle(self, tmp_path):
+        """Test the last writes before an idle period are still fsynced."""
+        model = MemoryTaskModel(str(tmp_path), fsync="interval", fsync_interval=0.01)
+
+        with patch("apps.tasks.memory.os.fsync") as mock_fsync:
+            model.create_task("Test Task")
+            for _ in range(100):
+                if mock_fsync.called:
+                    break
+                time.sleep(0.01)
+
+        assert mock_fsync.called
+        assert model._unsynced is False
+        model.close()
+        assert not model._sync_thread.is_alive()
+
+    def test_recovery_rejects_corrupt_log_entry(self, tmp_path):
+        """Test a bad entry before the end of the log is not skipped."""
+        model = MemoryTaskModel(str(tmp_path), fsync="always")
+        model.create_task("First")
+        model.close()
+
+        log_path = tmp_path / MemoryTaskModel.LOG_FILE
+        with open(log_path, "a") as f:
+            f.write('{"op": "delete"\n{"op": "delete", "id": "x"}\n')
+
+        log = log_path.read_bytes()
+        with pytest.raises(ValueError):
+            MemoryTaskModel(str(tmp_path))
+        assert log_path.read_bytes() == log
+
+    def test_invalid_fsync_policy(self, tmp_path):
+        """Test unknown fsync policies are rejected."""
+        with pytest.raises(ValueError):
+            MemoryTaskModel(str(tmp_path), fsync="sometimes")